@@ -1,3 +1,5 @@
+import asyncio
+import os
 from typing import Optional
 
 import prisma
@@ -16,7 +18,17 @@ class UserAuthenticationResponse(BaseModel):
     message: str
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=int(os.getenv("BCRYPT_ROUNDS", "12")),
+)
+
+# Verified against when the user does not exist so that both outcomes pay the
+# same bcrypt cost and response timing does not reveal registered emails. This
+# only holds while stored hashes use the configured cost too, which is why
+# authenticateUser rehashes any password whose cost differs from it.
+_DUMMY_HASH = pwd_context.hash("dummy-invariant-password")
 
 
 async def authenticateUser(email: str, password: str) -> UserAuthenticationResponse:
@@ -31,13 +43,18 @@ async def authenticateUser(email: str, password: str) -> UserAuthenticationRespo
       UserAuthenticationResponse: This model defines the structure of the response following an authentication attempt. It will convey whether the authentication was successful and provide an authentication token for successful logins.
     """
     user = await prisma.models.User.prisma().find_unique(where={"email": email})
-    if not user:
+    verified, new_hash = await asyncio.to_thread(
+        pwd_context.verify_and_update,
+        password,
+        user.hashedPassword if user else _DUMMY_HASH,
+    )
+    if not (user and verified):
         return UserAuthenticationResponse(
-            success=False, message="Authentication failed. User not found."
+            success=False, message="Authentication failed. Invalid email or password."
         )
-    if not pwd_context.verify(password, user.hashedPassword):
-        return UserAuthenticationResponse(
-            success=False, message="Authentication failed. Incorrect password."
+    if new_hash:
+        await prisma.models.User.prisma().update(
+            where={"id": user.id}, data={"hashedPassword": new_hash}
         )
     fake_token = "generated_fake_token_for_demo_purposes"
     return UserAuthenticationResponse(
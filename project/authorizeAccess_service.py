@@ -1,10 +1,18 @@
+import hashlib
+import logging
+from datetime import datetime
 from typing import Optional
 
 import prisma
 import prisma.enums
 import prisma.models
+import project.redis_client
+import redis.exceptions
+from cachetools import TTLCache
 from pydantic import BaseModel
 
+logger = logging.getLogger(__name__)
+
 
 class AuthorizeAccessResponse(BaseModel):
     """
@@ -16,12 +24,31 @@ class AuthorizeAccessResponse(BaseModel):
     error_code: Optional[str] = None
 
 
+# Denials are cached briefly so a newly issued key or subscription takes effect
+# quickly, while grants are served from memory, then Redis, for longer.
+_granted_cache: TTLCache = TTLCache(maxsize=100_000, ttl=30)
+
+_denied_cache: TTLCache = TTLCache(maxsize=100_000, ttl=5)
+
+_GRANTED_REDIS_TTL = 300
+
+_DENIED_REDIS_TTL = 5
+
+
+def _cache_key(user_id: str, api_key: str, resource: str) -> str:
+    digest = hashlib.sha256("\0".join((user_id, api_key, resource)).encode())
+    return f"authz:{digest.hexdigest()}"
+
+
 async def authorizeAccess(
     user_id: str, api_key: str, resource: str
 ) -> AuthorizeAccessResponse:
     """
     Grants or denies access to specific features or data based on user roles.
 
+    Decisions are cached per (user_id, api_key, resource) in process and in Redis,
+    so repeated checks skip the database.
+
     Args:
         user_id (str): The unique identifier of the user requesting access.
         api_key (str): The API key used for validating the request, ensuring it's coming from an authenticated user or service.
@@ -30,15 +57,64 @@ async def authorizeAccess(
     Returns:
         AuthorizeAccessResponse: Response model indicating the authorization result for accessing a specific feature or dataset.
     """
-    user = await prisma.models.User.prisma().find_unique(where={"id": user_id})
+    key = _cache_key(user_id, api_key, resource)
+    cached = _granted_cache.get(key) or _denied_cache.get(key)
+    if cached is not None:
+        return cached
+    # Redis is only a shared cache; if it is unavailable the decision comes from
+    # the database.
+    client = project.redis_client.get_client()
+    try:
+        raw = await client.get(key)
+    except redis.exceptions.RedisError:
+        logger.warning("Error reading access decision from Redis", exc_info=True)
+        raw = None
+    if raw is not None:
+        res = AuthorizeAccessResponse.model_validate_json(raw)
+    else:
+        res = await _authorizeAccess(user_id, api_key, resource)
+        try:
+            await client.set(
+                key,
+                res.model_dump_json(),
+                ex=_GRANTED_REDIS_TTL if res.access_granted else _DENIED_REDIS_TTL,
+            )
+        except redis.exceptions.RedisError:
+            logger.warning("Error writing access decision to Redis", exc_info=True)
+    if res.access_granted:
+        _granted_cache[key] = res
+    else:
+        _denied_cache[key] = res
+    return res
+
+
+async def _authorizeAccess(
+    user_id: str, api_key: str, resource: str
+) -> AuthorizeAccessResponse:
+    """
+    Evaluates an access decision against the database, bypassing the caches.
+    """
+    include = {"apiKeys": {"where": {"key": api_key}}}
+    if resource == "premium_content":
+        include["subscriptions"] = {
+            "where": {
+                "type": {
+                    "in": [
+                        prisma.enums.SubscriptionType.MONTHLY,
+                        prisma.enums.SubscriptionType.YEARLY,
+                    ]
+                },
+                "endDate": {"gt": datetime.utcnow()},
+            }
+        }
+    user = await prisma.models.User.prisma().find_unique(
+        where={"id": user_id}, include=include
+    )
     if not user:
         return AuthorizeAccessResponse(
             access_granted=False, message="User not found.", error_code="USER_NOT_FOUND"
         )
-    api_key_record = await prisma.models.ApiKey.prisma().find_unique(
-        where={"key": api_key}
-    )
-    if not api_key_record or api_key_record.userId != user_id:
+    if not user.apiKeys:
         return AuthorizeAccessResponse(
             access_granted=False,
             message="Invalid API key.",
@@ -48,19 +124,7 @@ async def authorizeAccess(
         prisma.enums.UserRole.ADMIN,
         prisma.enums.UserRole.DEVELOPER,
     ]:
-        subscription = await prisma.models.Subscription.prisma().find_many(
-            where={
-                "userId": user_id,
-                "type": {
-                    "in": [
-                        prisma.enums.SubscriptionType.MONTHLY,
-                        prisma.enums.SubscriptionType.YEARLY,
-                    ]
-                },
-                "endDate": {"gt": "CURRENT_DATE_PLACEHOLDER"},
-            }
-        )
-        if not subscription:
+        if not user.subscriptions:
             return AuthorizeAccessResponse(
                 access_granted=False,
                 message="Access denied. Valid subscription required for premium content.",
@@ -0,0 +1,17 @@
+import functools
+
+from lxml.cssselect import CSSSelector
+
+
+@functools.lru_cache(maxsize=2048)
+def compiled_selector(selector: str) -> CSSSelector:
+    """
+    Compiles a CSS selector to an lxml XPath selector, caching the result per selector string.
+
+    Args:
+        selector (str): The CSS selector.
+
+    Returns:
+        CSSSelector: The compiled selector, callable on a parsed tree.
+    """
+    return CSSSelector(selector)
@@ -1,9 +1,19 @@
+import hashlib
+import logging
 from typing import Dict, Optional
 
-import requests
-from bs4 import BeautifulSoup
+import msgspec
+import project.css
+import project.html_parser
+import project.http_client
+import project.redis_client
+import redis.exceptions
+from cachetools import TTLCache
+from lxml import etree
 from pydantic import BaseModel
 
+logger = logging.getLogger(__name__)
+
 
 class ExtractMetadataResponse(BaseModel):
     """
@@ -16,9 +26,46 @@ class ExtractMetadataResponse(BaseModel):
     additional_metadata: Dict[str, str]
 
 
-def extractMetadata(
+class ExtractMetadataStruct(msgspec.Struct, kw_only=True):
+    """
+    msgspec counterpart of ExtractMetadataResponse, encoded directly by the endpoint.
+    """
+
+    title: str
+    description: Optional[str] = None
+    image_url: Optional[str] = None
+    additional_metadata: Dict[str, str]
+
+
+_HEADERS = {"User-Agent": "Mozilla/5.0", "Accept-Encoding": "br, gzip"}
+
+# smart_strings=False returns plain str results, which do not keep a reference
+# to the parsed document alive once they are cached.
+_TITLE_XPATH = etree.XPath("string(//title)", smart_strings=False)
+
+_DESC_XPATH = etree.XPath('//meta[@name="description"]/@content', smart_strings=False)
+
+_OG_XPATH = etree.XPath('//meta[@property="og:image"]/@content', smart_strings=False)
+
+# Results are cached in process and shared across workers through Redis, since
+# the same URLs tend to be previewed many times.
+_CACHE_TTL = 300
+
+_metadata_cache: TTLCache = TTLCache(maxsize=10_000, ttl=_CACHE_TTL)
+
+_decoder = msgspec.json.Decoder(ExtractMetadataStruct)
+
+
+def _redis_key(
     url: str, custom_rules: Dict[str, str], content_type: Optional[str]
-) -> ExtractMetadataResponse:
+) -> str:
+    encoded = msgspec.json.encode([url, sorted(custom_rules.items()), content_type])
+    return f"meta:{hashlib.sha256(encoded).hexdigest()}"
+
+
+async def extractMetadata(
+    url: str, custom_rules: Dict[str, str], content_type: Optional[str]
+) -> ExtractMetadataStruct:
     """
     Extracts metadata from the provided webpage content.
 
@@ -28,41 +75,67 @@ def extractMetadata(
     content_type (Optional[str]): An optional field specifying the type of content to focus the extraction on e.g., 'text/html', 'application/json'. This could enhance extraction accuracy for specific page types.
 
     Returns:
-    ExtractMetadataResponse: The response model provides the extracted metadata in a structured format, including the page title, description, and any found image URLs. It represents the outcome of the metadata extraction process.
+    ExtractMetadataStruct: The response model provides the extracted metadata in a structured format, including the page title, description, and any found image URLs. It represents the outcome of the metadata extraction process.
     """
-    headers = {"User-Agent": "Mozilla/5.0"}
-    response = requests.get(url, headers=headers)
+    cache_key = (url, frozenset(custom_rules.items()), content_type)
+    cached = _metadata_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    client = project.redis_client.get_client()
+    redis_key = _redis_key(url, custom_rules, content_type)
+    try:
+        raw = await client.get(redis_key)
+    except redis.exceptions.RedisError:
+        logger.warning("Error reading cached metadata from Redis", exc_info=True)
+        raw = None
+    if raw is not None:
+        result = _decoder.decode(raw)
+        _metadata_cache[cache_key] = result
+        return result
+    # The default meta lookups only need the <head>; custom selectors may target the body.
+    response, body = await project.http_client.fetch_bounded(
+        url, headers=_HEADERS, stop_at=None if custom_rules else b"</head>"
+    )
     if content_type and response.headers["Content-Type"] != content_type:
         raise ValueError(
             f"Content type {response.headers['Content-Type']} does not match the expected {content_type}"
         )
-    soup = BeautifulSoup(response.content, "html.parser")
-    title = soup.title.string if soup.title else "No title found"
+    tree = project.html_parser.parse_html(body, response.charset)
+    title = _TITLE_XPATH(tree) or "No title found"
     description = None
     image_url = None
     additional_metadata = {}
-    if "description" in custom_rules:
-        description_selector = custom_rules["description"]
-        description_tag = soup.select_one(description_selector)
-        if description_tag:
-            description = description_tag.text
+    description_selector = custom_rules.get("description")
+    if description_selector:
+        description_tags = project.css.compiled_selector(description_selector)(tree)
+        if description_tags:
+            description = str(description_tags[0].text_content())
     else:
-        meta_desc = soup.find("meta", attrs={"name": "description"})
+        meta_desc = _DESC_XPATH(tree)
         if meta_desc:
-            description = meta_desc["content"]
-    if "image_url" in custom_rules:
-        image_url_selector = custom_rules["image_url"]
-        image_url_tag = soup.select_one(image_url_selector)
-        if image_url_tag:
-            image_url = image_url_tag["src"] if "src" in image_url_tag.attrs else None
+            description = meta_desc[0]
+    image_url_selector = custom_rules.get("image_url")
+    if image_url_selector:
+        image_url_tags = project.css.compiled_selector(image_url_selector)(tree)
+        if image_url_tags:
+            image_url = image_url_tags[0].get("src")
     else:
-        og_image = soup.find("meta", property="og:image")
+        og_image = _OG_XPATH(tree)
         if og_image:
-            image_url = og_image["content"]
+            image_url = og_image[0]
     additional_metadata["url_length"] = str(len(url))
-    return ExtractMetadataResponse(
+    result = ExtractMetadataStruct(
         title=title,
         description=description,
         image_url=image_url,
         additional_metadata=additional_metadata,
     )
+    # Error pages are returned as-is but never cached.
+    if 200 <= response.status < 300:
+        encoded = msgspec.json.encode(result)
+        _metadata_cache[cache_key] = result
+        try:
+            await client.set(redis_key, encoded, ex=_CACHE_TTL)
+        except redis.exceptions.RedisError:
+            logger.warning("Error writing cached metadata to Redis", exc_info=True)
+    return result
@@ -1,6 +1,9 @@
+import asyncio
 from typing import Optional
 
-import requests
+import aiohttp
+import msgspec
+import project.http_client
 from pydantic import BaseModel
 
 
@@ -15,7 +18,18 @@ class FetchContentResponse(BaseModel):
     status_code: int
 
 
-def fetchContent(url: str) -> FetchContentResponse:
+class FetchContentStruct(msgspec.Struct, kw_only=True):
+    """
+    msgspec counterpart of FetchContentResponse, encoded directly by the endpoint.
+    """
+
+    success: bool
+    content: Optional[str] = None
+    error_message: Optional[str] = None
+    status_code: int
+
+
+async def fetchContent(url: str) -> FetchContentStruct:
     """
     Fetches webpage content based on the provided URL and prepares it for further processing.
 
@@ -23,21 +37,18 @@ def fetchContent(url: str) -> FetchContentResponse:
         url (str): The URL of the webpage to be fetched.
 
     Returns:
-        FetchContentResponse: Model representing the response of fetching webpage content.
+        FetchContentStruct: Model representing the response of fetching webpage content.
     """
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        fetched_content = response.text
-        return FetchContentResponse(
-            success=True, content=fetched_content, status_code=response.status_code
+        response, body = await project.http_client.fetch_bounded(
+            url, raise_for_status=True
         )
-    except requests.RequestException as e:
-        status_code = (
-            e.response.status_code
-            if hasattr(e, "response") and e.response is not None
-            else 0
+        fetched_content = body.decode(response.charset or "utf-8", errors="replace")
+        return FetchContentStruct(
+            success=True, content=fetched_content, status_code=response.status
         )
-        return FetchContentResponse(
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        status_code = e.status if isinstance(e, aiohttp.ClientResponseError) else 0
+        return FetchContentStruct(
             success=False, error_message=str(e), status_code=status_code
         )
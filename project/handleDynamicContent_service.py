@@ -1,9 +1,10 @@
 from typing import Dict, List, Optional
 
-import prisma
-import prisma.models
-import requests
-from bs4 import BeautifulSoup
+import project.css
+import project.html_parser
+import project.http_client
+import project.preview_writer
+from lxml import etree
 from pydantic import BaseModel
 
 
@@ -17,12 +18,19 @@ class DynamicContentFetchResponse(BaseModel):
     extracted_metadata: Dict[str, str]
 
 
+_HEADERS = {"Accept-Encoding": "br, gzip"}
+
+_TITLE_XPATH = etree.XPath("string(//title)", smart_strings=False)
+
+
 async def handleDynamicContent(
     url: str, content_selectors: Optional[List[str]] = None
 ) -> DynamicContentFetchResponse:
     """
     Processes web pages with dynamic content to allow for metadata extraction.
 
+    The PagePreview row is queued for the background writer, so success reflects the extraction only; a failed database write is logged, not reported.
+
     Args:
     url (str): The URL of the web page to process.
     content_selectors (Optional[List[str]]): CSS selectors to specify which parts of the dynamically loaded content are of interest. Optional.
@@ -31,22 +39,22 @@ async def handleDynamicContent(
     DynamicContentFetchResponse: The structure representing the result of processing a web page to extract metadata including dynamic content.
     """
     try:
-        response = requests.get(url)
-        if response.status_code != 200:
+        response, body = await project.http_client.fetch_bounded(url, headers=_HEADERS)
+        if response.status != 200:
             return DynamicContentFetchResponse(
                 success=False,
-                message=f"Failed to fetch the page: {response.status_code}",
+                message=f"Failed to fetch the page: {response.status}",
                 extracted_metadata={},
             )
-        soup = BeautifulSoup(response.content, "html.parser")
-        metadata = {"title": soup.title.string if soup.title else "No title found"}
+        tree = project.html_parser.parse_html(body, response.charset)
+        metadata = {"title": _TITLE_XPATH(tree) or "No title found"}
         if content_selectors:
             for selector in content_selectors:
-                extracted_content = soup.select_one(selector)
+                extracted_content = project.css.compiled_selector(selector)(tree)
                 if extracted_content:
-                    metadata[selector] = extracted_content.text.strip()
-        await prisma.models.PagePreview.prisma().create(
-            data={
+                    metadata[selector] = extracted_content[0].text_content().strip()
+        await project.preview_writer.enqueue(
+            {
                 "url": url,
                 "title": metadata.get("title"),
                 "description": metadata.get("description", "No description provided"),
@@ -0,0 +1,34 @@
+import functools
+from typing import Optional
+
+import lxml.etree
+import lxml.html
+
+
+@functools.lru_cache(maxsize=64)
+def _parser(encoding: Optional[str]) -> lxml.html.HTMLParser:
+    try:
+        return lxml.html.HTMLParser(encoding=encoding)
+    except LookupError:
+        # libxml2 does not know this charset; let it detect one instead.
+        return _parser(None)
+
+
+def parse_html(body: bytes, charset: Optional[str] = None) -> lxml.html.HtmlElement:
+    """
+    Parses an HTML document, decoding it with the charset declared in the HTTP Content-Type header when there is one.
+
+    Without a declared charset libxml2 only honours <meta charset> and otherwise falls back to Latin-1, as it does for a header charset it does not recognise.
+    A body with no elements (empty, whitespace, or only a doctype, comment or XML declaration) yields an empty <html> element instead of a ParserError.
+
+    Args:
+        body (bytes): The raw document bytes.
+        charset (Optional[str]): The charset from the response's Content-Type header, if any.
+
+    Returns:
+        lxml.html.HtmlElement: The root of the parsed document.
+    """
+    try:
+        return lxml.html.fromstring(body, parser=_parser(charset or None))
+    except lxml.etree.ParserError:
+        return lxml.html.Element("html")
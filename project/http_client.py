@@ -0,0 +1,90 @@
+from typing import Optional, Tuple
+
+import aiohttp
+
+_client: Optional[aiohttp.ClientSession] = None
+
+_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=3)
+
+# Upper bound on the body bytes read from any single page.
+MAX_BYTES = 512 * 1024
+
+_CHUNK_SIZE = 16_384
+
+
+def open_client() -> aiohttp.ClientSession:
+    """
+    Creates the shared outbound HTTP session used by the fetching services.
+
+    Must be called from within the running event loop.
+
+    Returns:
+        aiohttp.ClientSession: The session, also kept at module level for get_client.
+    """
+    global _client
+    # Keep-alive pool shared by every outbound fetch so repeat hosts skip the
+    # TCP and TLS handshakes. Lookups go through aiodns instead of the thread
+    # pool running getaddrinfo, and are cached for five minutes.
+    connector = aiohttp.TCPConnector(
+        limit=200,
+        keepalive_timeout=60,
+        resolver=aiohttp.AsyncResolver(),
+        use_dns_cache=True,
+        ttl_dns_cache=300,
+    )
+    _client = aiohttp.ClientSession(connector=connector, timeout=_TIMEOUT)
+    return _client
+
+
+async def close_client() -> None:
+    """
+    Closes the shared outbound HTTP session and releases its connections.
+    """
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+def get_client() -> aiohttp.ClientSession:
+    """
+    Returns the shared outbound HTTP session opened during application startup.
+
+    Returns:
+        aiohttp.ClientSession: The shared session.
+    """
+    if _client is None:
+        raise RuntimeError("HTTP client is not initialized")
+    return _client
+
+
+async def fetch_bounded(
+    url: str,
+    headers: Optional[dict] = None,
+    stop_at: Optional[bytes] = None,
+    raise_for_status: bool = False,
+) -> Tuple[aiohttp.ClientResponse, bytes]:
+    """
+    Streams a page and stops reading once MAX_BYTES or the stop_at marker is reached.
+
+    Args:
+        url (str): The URL of the page to fetch.
+        headers (Optional[dict]): Extra request headers.
+        stop_at (Optional[bytes]): Lowercase marker, e.g. b"</head>", after which the rest of the body is not needed.
+        raise_for_status (bool): Raise aiohttp.ClientResponseError before reading the body of an error response.
+
+    Returns:
+        Tuple[aiohttp.ClientResponse, bytes]: The response (already closed) and the body bytes read.
+    """
+    buf = bytearray()
+    async with get_client().get(url, headers=headers) as response:
+        if raise_for_status:
+            response.raise_for_status()
+        async for chunk in response.content.iter_chunked(_CHUNK_SIZE):
+            start = max(0, len(buf) - len(stop_at)) if stop_at else 0
+            buf += chunk
+            if len(buf) >= MAX_BYTES:
+                break
+            if stop_at and stop_at in buf[start:].lower():
+                break
+    return response, bytes(buf[:MAX_BYTES])
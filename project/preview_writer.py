@@ -0,0 +1,98 @@
+import asyncio
+import logging
+from typing import List, Optional
+
+import prisma
+import prisma.models
+
+logger = logging.getLogger(__name__)
+
+_BATCH_SIZE = 100
+
+_FLUSH_INTERVAL = 0.01
+
+# Bounds memory while the database is slow; enqueue waits for room instead.
+_MAX_QUEUED = 10_000
+
+_queue: Optional[asyncio.Queue] = None
+
+_task: Optional[asyncio.Task] = None
+
+
+def start() -> None:
+    """
+    Starts the background task that writes queued page previews in batches.
+
+    Must be called from within the running event loop.
+    """
+    global _queue, _task
+    _queue = asyncio.Queue(maxsize=_MAX_QUEUED)
+    _task = asyncio.create_task(_run(_queue))
+
+
+async def stop() -> None:
+    """
+    Flushes any queued page previews and stops the background writer.
+    """
+    global _queue, _task
+    if _queue is None or _task is None:
+        return
+    await _queue.put(None)
+    await _task
+    _queue = None
+    _task = None
+
+
+async def enqueue(data: dict) -> None:
+    """
+    Queues a page preview row to be written with the next batch, waiting if the queue is full.
+
+    The row is written after this returns, so a failed write is only logged and never reaches the caller.
+
+    Args:
+        data (dict): The PagePreview create data.
+    """
+    if _queue is None:
+        raise RuntimeError("Page preview writer is not running")
+    await _queue.put(data)
+
+
+async def _run(queue: asyncio.Queue) -> None:
+    while True:
+        item = await queue.get()
+        if item is None:
+            return
+        batch = [item]
+        stopping = False
+        # Let the batch fill, then drain without waiting so no get is ever
+        # cancelled mid-flight.
+        await asyncio.sleep(_FLUSH_INTERVAL)
+        while len(batch) < _BATCH_SIZE:
+            try:
+                item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if item is None:
+                stopping = True
+                break
+            batch.append(item)
+        await _flush(batch)
+        if stopping:
+            return
+
+
+async def _flush(batch: List[dict]) -> None:
+    try:
+        await prisma.models.PagePreview.prisma().create_many(
+            data=batch, skip_duplicates=True
+        )
+        return
+    except Exception:
+        logger.exception(
+            "Error writing %d page previews, retrying individually", len(batch)
+        )
+    for data in batch:
+        try:
+            await prisma.models.PagePreview.prisma().create(data=data)
+        except Exception:
+            logger.exception("Error writing page preview for %s", data.get("url"))
@@ -0,0 +1,77 @@
+import json
+import logging
+import time
+from typing import List
+from urllib.parse import urlsplit
+
+import project.redis_client
+import redis.exceptions
+from fastapi import Request
+from fastapi.responses import ORJSONResponse
+
+logger = logging.getLogger(__name__)
+
+
+def config_key(target: str) -> str:
+    """
+    Returns the Redis key holding the rate limit configured for a user ID or domain.
+    """
+    return f"rl:cfg:{target}"
+
+
+async def is_rate_limited(targets: List[str]) -> bool:
+    """
+    Counts a request against the rate limits configured for the given targets.
+
+    Uses a fixed window per target: the window counter is incremented and given an expiry in a single Redis transaction.
+
+    Args:
+        targets (List[str]): The user IDs and domains the request is attributed to.
+
+    Returns:
+        bool: True if any target has exceeded its maximum number of requests in the current window.
+    """
+    client = project.redis_client.get_client()
+    configs = await client.mget([config_key(target) for target in targets])
+    now = int(time.time())
+    limits = []
+    async with client.pipeline(transaction=True) as pipe:
+        for target, raw in zip(targets, configs):
+            if raw is None:
+                continue
+            config = json.loads(raw)
+            duration = max(config["dur"], 1)
+            window_key = f"rl:{target}:{now // duration}"
+            pipe.incr(window_key)
+            pipe.expire(window_key, duration)
+            limits.append(config["max"])
+        if not limits:
+            return False
+        results = await pipe.execute()
+    return any(count > limit for count, limit in zip(results[::2], limits))
+
+
+async def enforce_rate_limit(request: Request, call_next):
+    """
+    Rejects requests whose user or target domain has exceeded its configured rate limit.
+
+    If Redis is unavailable the request is let through rather than failing the API.
+    """
+    targets = []
+    user_id = request.query_params.get("user_id")
+    if user_id:
+        targets.append(user_id)
+    url = request.query_params.get("url")
+    if url:
+        domain = urlsplit(url).hostname
+        if domain:
+            targets.append(domain)
+    if targets:
+        try:
+            limited = await is_rate_limited(targets)
+        except redis.exceptions.RedisError:
+            logger.warning("Error checking rate limit, allowing request", exc_info=True)
+            limited = False
+        if limited:
+            return ORJSONResponse({"error": "Rate limit exceeded"}, status_code=429)
+    return await call_next(request)
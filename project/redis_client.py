@@ -0,0 +1,40 @@
+import os
+from typing import Optional
+
+import redis.asyncio
+
+_client: Optional[redis.asyncio.Redis] = None
+
+
+def open_client() -> redis.asyncio.Redis:
+    """
+    Creates the shared Redis client used for caching across workers.
+
+    Returns:
+        redis.asyncio.Redis: The client, also kept at module level for get_client.
+    """
+    global _client
+    _client = redis.asyncio.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    return _client
+
+
+async def close_client() -> None:
+    """
+    Closes the shared Redis client and releases its connections.
+    """
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_client() -> redis.asyncio.Redis:
+    """
+    Returns the shared Redis client opened during application startup.
+
+    Returns:
+        redis.asyncio.Redis: The shared client.
+    """
+    if _client is None:
+        raise RuntimeError("Redis client is not initialized")
+    return _client
@@ -1,18 +1,22 @@
 import logging
 from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
+import msgspec
 import project.authenticateUser_service
 import project.authorizeAccess_service
 import project.extractMetadata_service
 import project.fetchContent_service
 import project.handleDynamicContent_service
+import project.http_client
+import project.preview_writer
+import project.rate_limit
+import project.redis_client
 import project.setRateLimit_service
 import project.updateCompliancePolicies_service
 from fastapi import FastAPI
-from fastapi.encoders import jsonable_encoder
-from fastapi.responses import Response
+from fastapi.responses import ORJSONResponse, Response
 from prisma import Prisma
 
 logger = logging.getLogger(__name__)
@@ -23,17 +27,40 @@ db_client = Prisma(auto_register=True)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await db_client.connect()
+    project.http_client.open_client()
+    project.redis_client.open_client()
+    project.preview_writer.start()
     yield
+    await project.preview_writer.stop()
+    await project.redis_client.close_client()
+    await project.http_client.close_client()
     await db_client.disconnect()
 
 
 app = FastAPI(
     title="URL Preview API",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     description="To accomplish the task of creating an endpoint that accepts a URL, retrieves webpage content, extracts relevant metadata, generates a preview snippet including the page title, description, and thumbnail image, and returns the structured preview data for use in link sharing and embedding, the following plan is proposed based on the information gathered and tools available:\n\n1. **Tech Stack**:\n- Programming Language: Python\n- API Framework: FastAPI\n- Database: PostgreSQL\n- ORM: Prisma\n\n2. **Requirements Summary**:\n- High accuracy and efficiency in extracting text, images, and other media while preserving the original structure.\n- Supports various content types across different web technologies.\n- Extracts important metadata accurately such as keywords, descriptions, authorship, publication dates, and provides options for content localization.\n- Handles dynamic content loaded with JavaScript.\n- Scalable, with robust error handling and ease of integration into existing systems.\n- Custom extraction rules to accommodate special needs.\n\n3. **Solution Approach**:\n- Utilize the 'Requests' library for retrieving webpage content.\n- Implement 'Beautiful Soup' for parsing HTML content and extracting text, images, and other media.\n- Use 'Scrapy' for more comprehensive web scraping needs, handling dynamic JavaScript-loaded content, and efficient crawling of required metadata.\n- Leverage HTML parsing libraries, with particular attention to meta tags like Open Graph (OG) tags, Twitter Cards, for extracting metadata that aids in generating preview snippets.\n- Incorporate server-side rendering techniques for single-page applications to ensure metadata is accessible.\n- Validate extracted metadata for accuracy and completeness.\n- Adhere to respectful web scraping guidelines, including obeying robots.txt directives and rate limiting requests.\n\n4. **Challenges & Considerations**:\n- Ensuring the accuracy of metadata extraction is prioritized over the speed of retrieval and processing.\n- Regularly updating extraction logic to adapt to changes in web technologies.\n- Maintaining privacy and security in handling extracted data.\n\n5. **Example Target URLs**: Consumer forums, product review sites (e.g., Capterra, G2 Crowd), and industry news portals (e.g., TechCrunch, Wired).\n\n6. **Best Practices**:\n- Utilizing meta tags for consistent and accurate information.\n- Employing HTML parsing libraries for metadata extraction, handling exceptions gracefully.\n- Validating extracted metadata, providing fallbacks where necessary, ensuring user privacy, and updating extraction logic regularly.\n\nThis comprehensive plan outlines the technology, strategies, and considerations necessary to develop a reliable and efficient tool for webpage content retrieval and metadata extraction. It's designed to meet the specific needs and priorities of the user, focusing on accuracy, scalability, and ease of integration.",
 )
 
 
+class MsgspecJSONResponse(ORJSONResponse):
+    """
+    Encodes msgspec structs directly, skipping Pydantic validation and serialization.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return msgspec.json.encode(content)
+
+
+def _err(e: Exception) -> ORJSONResponse:
+    return ORJSONResponse({"error": str(e)}, status_code=500)
+
+
+app.middleware("http")(project.rate_limit.enforce_rate_limit)
+
+
 @app.post(
     "/access/authorize",
     response_model=project.authorizeAccess_service.AuthorizeAccessResponse,
@@ -51,13 +78,7 @@ async def api_post_authorizeAccess(
         return res
     except Exception as e:
         logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+        return _err(e)
 
 
 @app.post(
@@ -66,22 +87,16 @@ async def api_post_authorizeAccess(
 )
 async def api_post_fetchContent(
     url: str,
-) -> project.fetchContent_service.FetchContentResponse | Response:
+) -> Response:
     """
     Fetches webpage content based on the provided URL and prepares it for further processing.
     """
     try:
-        res = project.fetchContent_service.fetchContent(url)
-        return res
+        res = await project.fetchContent_service.fetchContent(url)
+        return MsgspecJSONResponse(res)
     except Exception as e:
         logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+        return _err(e)
 
 
 @app.post(
@@ -99,13 +114,7 @@ async def api_post_authenticateUser(
         return res
     except Exception as e:
         logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+        return _err(e)
 
 
 @app.post(
@@ -114,24 +123,18 @@ async def api_post_authenticateUser(
 )
 async def api_post_extractMetadata(
     url: str, custom_rules: Dict[str, str], content_type: Optional[str]
-) -> project.extractMetadata_service.ExtractMetadataResponse | Response:
+) -> Response:
     """
     Extracts metadata from the provided webpage content.
     """
     try:
-        res = project.extractMetadata_service.extractMetadata(
+        res = await project.extractMetadata_service.extractMetadata(
             url, custom_rules, content_type
         )
-        return res
+        return MsgspecJSONResponse(res)
     except Exception as e:
         logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+        return _err(e)
 
 
 @app.post(
@@ -150,13 +153,7 @@ async def api_post_setRateLimit(
         return res
     except Exception as e:
         logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+        return _err(e)
 
 
 @app.post(
@@ -176,13 +173,7 @@ async def api_post_handleDynamicContent(
         return res
     except Exception as e:
         logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+        return _err(e)
 
 
 @app.patch(
@@ -202,10 +193,4 @@ async def api_patch_updateCompliancePolicies(
         return res
     except Exception as e:
         logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+        return _err(e)
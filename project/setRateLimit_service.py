@@ -1,7 +1,9 @@
-from datetime import datetime, timedelta
+import json
 
 import prisma
 import prisma.models
+import project.rate_limit
+import project.redis_client
 from pydantic import BaseModel
 
 
@@ -32,21 +34,17 @@ async def setRateLimit(
     SetRateLimitResponse: Describes the outcome of configuring the rate limiting rules, including whether the operation was successful and details about the new rate limit settings.
     """
     try:
-        user_or_domain = await prisma.models.User.prisma().find_unique(
-            where={"email": target}
-        )
-        if user_or_domain is None:
-            user_or_domain_id = None
-        else:
-            user_or_domain_id = user_or_domain.id
-        reset_at = datetime.now() + timedelta(seconds=duration_in_seconds)
-        rate_limit = await prisma.models.RateLimit.prisma().create(
-            data={
-                "userId": user_or_domain_id,
-                "requests": 0,
-                "limit": max_requests,
-                "resetAt": reset_at,
-            }
+        # Enforcement sees user ids rather than emails, so resolve them once here.
+        target_key = target
+        if "@" in target:
+            user = await prisma.models.User.prisma().find_unique(
+                where={"email": target}
+            )
+            if user is not None:
+                target_key = user.id
+        await project.redis_client.get_client().set(
+            project.rate_limit.config_key(target_key),
+            json.dumps({"max": max_requests, "dur": duration_in_seconds}),
         )
         success_msg = "Rate limit configuration successful."
         return SetRateLimitResponse(
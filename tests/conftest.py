@@ -0,0 +1,15 @@
+import sys
+import types
+
+import prisma
+
+# The generated Prisma client (prisma.models, prisma.enums) only exists after
+# `prisma generate`. Register empty placeholders when it is missing so the
+# service modules import; tests patch in the models they use.
+try:
+    import prisma.models  # noqa: F401
+except ImportError:
+    for _name in ("models", "enums"):
+        _module = types.ModuleType(f"prisma.{_name}")
+        sys.modules[f"prisma.{_name}"] = _module
+        setattr(prisma, _name, _module)
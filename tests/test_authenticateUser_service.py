@@ -0,0 +1,90 @@
+import asyncio
+
+import prisma.models
+import project.authenticateUser_service as service
+import pytest
+from passlib.context import CryptContext
+
+
+class FakeUser:
+    def __init__(self, email: str, hashedPassword: str):
+        self.id = "user-1"
+        self.email = email
+        self.hashedPassword = hashedPassword
+
+
+class FakeUserActions:
+    def __init__(self, users):
+        self.users = {user.email: user for user in users}
+        self.updates = []
+
+    async def find_unique(self, where):
+        return self.users.get(where["email"])
+
+    async def update(self, where, data):
+        self.updates.append((where, data))
+        for user in self.users.values():
+            if user.id == where["id"]:
+                user.hashedPassword = data["hashedPassword"]
+                return user
+
+
+@pytest.fixture
+def users(monkeypatch):
+    actions = FakeUserActions(
+        [FakeUser("user@example.com", service.pwd_context.hash("s3cret"))]
+    )
+    monkeypatch.setattr(
+        prisma.models,
+        "User",
+        type("User", (), {"prisma": staticmethod(lambda: actions)}),
+        raising=False,
+    )
+    return actions
+
+
+def test_hash_and_verify():
+    hashed = service.pwd_context.hash("s3cret")
+
+    assert service.pwd_context.verify("s3cret", hashed)
+    assert not service.pwd_context.verify("wrong", hashed)
+    assert not service.pwd_context.verify("wrong", service._DUMMY_HASH)
+
+
+def test_authenticate_valid_password(users):
+    result = asyncio.run(service.authenticateUser("user@example.com", "s3cret"))
+
+    assert result.success
+    assert result.token
+
+
+def test_authenticate_rejects_wrong_password_and_unknown_email(users):
+    wrong = asyncio.run(service.authenticateUser("user@example.com", "wrong"))
+    unknown = asyncio.run(service.authenticateUser("nobody@example.com", "s3cret"))
+
+    assert not wrong.success and wrong.token is None
+    assert unknown.success is False
+    assert wrong.message == unknown.message
+
+
+def test_authenticate_leaves_current_hash_alone(users):
+    asyncio.run(service.authenticateUser("user@example.com", "s3cret"))
+    asyncio.run(service.authenticateUser("user@example.com", "wrong"))
+
+    assert users.updates == []
+
+
+def test_authenticate_rehashes_password_stored_at_another_cost(users):
+    user = users.users["user@example.com"]
+    user.hashedPassword = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash(
+        "s3cret"
+    )
+
+    result = asyncio.run(service.authenticateUser("user@example.com", "s3cret"))
+
+    assert result.success
+    assert users.updates == [
+        ({"id": "user-1"}, {"hashedPassword": user.hashedPassword})
+    ]
+    assert not service.pwd_context.needs_update(user.hashedPassword)
+    assert service.pwd_context.verify("s3cret", user.hashedPassword)
@@ -0,0 +1,126 @@
+import asyncio
+
+import fakeredis
+import msgspec
+import project.extractMetadata_service
+import project.http_client
+import project.redis_client
+import pytest
+import redis.exceptions
+
+PAGE = """<html><head>
+<title>Café – naïve</title>
+<meta name="description" content="A page about coffee">
+<meta property="og:image" content="https://example.com/og.png">
+</head><body><p class="lead">Lead paragraph</p><img class="hero" src="/hero.png"></body></html>
+""".encode()
+
+
+class FakeResponse:
+    def __init__(self, status=200, charset="utf-8"):
+        self.status = status
+        self.charset = charset
+        self.headers = {"Content-Type": f"text/html; charset={charset}"}
+
+
+@pytest.fixture(autouse=True)
+def fake_redis(monkeypatch):
+    client = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(project.redis_client, "_client", client)
+    project.extractMetadata_service._metadata_cache.clear()
+    return client
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    calls = []
+    page = {"response": FakeResponse(), "body": PAGE}
+
+    async def fetch_bounded(url, headers=None, stop_at=None, raise_for_status=False):
+        calls.append(url)
+        return page["response"], page["body"]
+
+    monkeypatch.setattr(project.http_client, "fetch_bounded", fetch_bounded)
+    return calls, page
+
+
+def _extract(url="https://example.com/", custom_rules=None):
+    return asyncio.run(
+        project.extractMetadata_service.extractMetadata(url, custom_rules or {}, None)
+    )
+
+
+def test_default_metadata_encodes_with_msgspec(fetches):
+    result = _extract()
+
+    assert msgspec.json.decode(msgspec.json.encode(result)) == {
+        "title": "Café – naïve",
+        "description": "A page about coffee",
+        "image_url": "https://example.com/og.png",
+        "additional_metadata": {"url_length": "20"},
+    }
+
+
+def test_custom_rules_encode_with_msgspec(fetches):
+    result = _extract(custom_rules={"description": "p.lead", "image_url": "img.hero"})
+
+    encoded = msgspec.json.decode(msgspec.json.encode(result))
+    assert encoded["description"] == "Lead paragraph"
+    assert encoded["image_url"] == "/hero.png"
+
+
+def test_results_are_served_from_cache(fetches):
+    calls, _ = fetches
+
+    first = _extract()
+    second = _extract()
+
+    assert calls == ["https://example.com/"]
+    assert second == first
+
+
+def test_results_are_shared_through_redis(fetches, fake_redis):
+    calls, _ = fetches
+
+    first = _extract()
+    project.extractMetadata_service._metadata_cache.clear()
+    second = _extract()
+
+    assert calls == ["https://example.com/"]
+    assert second == first
+
+
+@pytest.mark.parametrize("status", [404, 503])
+def test_error_pages_are_not_cached(fetches, fake_redis, status):
+    calls, page = fetches
+    page["response"] = FakeResponse(status=status)
+
+    _extract()
+    _extract()
+
+    assert len(calls) == 2
+    assert asyncio.run(fake_redis.keys("meta:*")) == []
+
+
+def test_redis_errors_are_treated_as_a_miss(fetches, monkeypatch):
+    class DownRedis:
+        async def get(self, key):
+            raise redis.exceptions.ConnectionError("connection refused")
+
+        async def set(self, key, value, ex=None):
+            raise redis.exceptions.ConnectionError("connection refused")
+
+    monkeypatch.setattr(project.redis_client, "_client", DownRedis())
+
+    assert _extract().title == "Café – naïve"
+
+
+def test_empty_page_has_no_title(fetches):
+    _, page = fetches
+    page["body"] = b"   "
+
+    result = _extract()
+
+    assert result.title == "No title found"
+    assert result.description is None
+    assert result.image_url is None
@@ -0,0 +1,56 @@
+import asyncio
+
+import project.handleDynamicContent_service
+import project.http_client
+import project.preview_writer
+import pytest
+
+PAGE = b"""<html><head><title>Dynamic</title></head>
+<body><div id="price"> 42 </div></body></html>"""
+
+
+class FakeResponse:
+    def __init__(self, status=200, charset="utf-8"):
+        self.status = status
+        self.charset = charset
+
+
+@pytest.fixture
+def page(monkeypatch):
+    page = {"response": FakeResponse(), "body": PAGE, "queued": []}
+
+    async def fetch_bounded(url, headers=None, stop_at=None, raise_for_status=False):
+        return page["response"], page["body"]
+
+    async def enqueue(data):
+        page["queued"].append(data)
+
+    monkeypatch.setattr(project.http_client, "fetch_bounded", fetch_bounded)
+    monkeypatch.setattr(project.preview_writer, "enqueue", enqueue)
+    return page
+
+
+def _handle(selectors=None):
+    return asyncio.run(
+        project.handleDynamicContent_service.handleDynamicContent(
+            "https://example.com/", selectors
+        )
+    )
+
+
+def test_extracts_title_and_selectors_from_bounded_body(page):
+    result = _handle(["#price"])
+
+    assert result.success
+    assert result.extracted_metadata == {"title": "Dynamic", "#price": "42"}
+    assert page["queued"][0]["url"] == "https://example.com/"
+
+
+def test_non_200_response_is_reported_and_not_stored(page):
+    page["response"] = FakeResponse(status=404)
+
+    result = _handle()
+
+    assert not result.success
+    assert result.message == "Failed to fetch the page: 404"
+    assert page["queued"] == []
@@ -0,0 +1,60 @@
+import project.html_parser
+import pytest
+
+TITLE = "Café – naïve"
+
+
+def _title(tree):
+    return tree.xpath("string(//title)")
+
+
+def test_header_charset_is_used_without_meta_charset():
+    body = f"<html><head><title>{TITLE}</title></head></html>".encode()
+
+    assert _title(project.html_parser.parse_html(body, "utf-8")) == TITLE
+
+
+@pytest.mark.parametrize(
+    "charset, text",
+    [
+        ("koi8-r", "Привет"),
+        ("EUC-JP", "日本語のページ"),
+        ("EUC-KR", "한국어 페이지"),
+        ("ISO-2022-JP", "日本語のページ"),
+        ("Shift_JIS", "日本語のページ"),
+    ],
+)
+def test_non_utf8_header_charset(charset, text):
+    body = f"<html><head><title>{text}</title></head></html>".encode(charset)
+
+    assert _title(project.html_parser.parse_html(body, charset)) == text
+
+
+def test_meta_charset_is_used_without_header_charset():
+    body = (
+        f'<html><head><meta charset="utf-8"><title>{TITLE}</title></head></html>'
+    ).encode()
+
+    assert _title(project.html_parser.parse_html(body, None)) == TITLE
+
+
+def test_unknown_header_charset_falls_back_to_detection():
+    body = b"<html><head><title>plain</title></head></html>"
+
+    assert _title(project.html_parser.parse_html(body, "no-such-charset")) == "plain"
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"",
+        b"  \n\t ",
+        b"<!DOCTYPE html>",
+        b"<!-- nothing here -->",
+        b'<?xml version="1.0" encoding="utf-8"?>',
+    ],
+)
+def test_empty_body_parses_to_empty_document(body):
+    tree = project.html_parser.parse_html(body, "utf-8")
+
+    assert _title(tree) == ""
@@ -0,0 +1,80 @@
+import asyncio
+
+import prisma.models
+import project.preview_writer
+import pytest
+
+
+class FakePagePreviewActions:
+    def __init__(self):
+        self.create_many_calls = []
+        self.rows = []
+        self.fail_create_many = False
+
+    async def create_many(self, data, skip_duplicates=False):
+        self.create_many_calls.append(list(data))
+        if self.fail_create_many:
+            raise RuntimeError("batch rejected")
+        self.rows.extend(data)
+        return len(data)
+
+    async def create(self, data):
+        if data["url"] == "bad":
+            raise RuntimeError("row rejected")
+        self.rows.append(data)
+        return data
+
+
+@pytest.fixture
+def previews(monkeypatch):
+    actions = FakePagePreviewActions()
+    monkeypatch.setattr(
+        prisma.models,
+        "PagePreview",
+        type("PagePreview", (), {"prisma": staticmethod(lambda: actions)}),
+        raising=False,
+    )
+    return actions
+
+
+def _row(url):
+    return {"url": url, "title": url, "userId": "user-1"}
+
+
+def _write(rows, settle=True):
+    async def run():
+        project.preview_writer.start()
+        for row in rows:
+            await project.preview_writer.enqueue(row)
+        if settle:
+            await asyncio.sleep(project.preview_writer._FLUSH_INTERVAL * 5)
+        await project.preview_writer.stop()
+
+    asyncio.run(run())
+
+
+def test_queued_rows_are_written_in_one_batch(previews):
+    _write([_row("a"), _row("b"), _row("c")])
+
+    assert previews.create_many_calls == [[_row("a"), _row("b"), _row("c")]]
+
+
+def test_stop_flushes_rows_still_queued(previews):
+    _write([_row("a"), _row("b")], settle=False)
+
+    assert previews.rows == [_row("a"), _row("b")]
+    assert project.preview_writer._task is None
+
+
+def test_failed_batch_falls_back_to_row_by_row_writes(previews):
+    previews.fail_create_many = True
+
+    _write([_row("a"), _row("bad"), _row("c")])
+
+    assert len(previews.create_many_calls) == 1
+    assert previews.rows == [_row("a"), _row("c")]
+
+
+def test_enqueue_requires_a_running_writer():
+    with pytest.raises(RuntimeError):
+        asyncio.run(project.preview_writer.enqueue(_row("a")))
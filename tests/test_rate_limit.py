@@ -0,0 +1,92 @@
+import asyncio
+import json
+
+import fakeredis
+import project.rate_limit
+import project.redis_client
+import pytest
+import redis.exceptions
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    client = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(project.redis_client, "_client", client)
+    return client
+
+
+def _configure(client, target: str, max_requests: int, duration: int) -> None:
+    asyncio.run(
+        client.set(
+            project.rate_limit.config_key(target),
+            json.dumps({"max": max_requests, "dur": duration}),
+        )
+    )
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.middleware("http")(project.rate_limit.enforce_rate_limit)
+
+    @app.post("/content/retrieve")
+    async def retrieve(url: str):
+        return {"url": url}
+
+    return app
+
+
+def test_unconfigured_targets_are_not_limited(fake_redis):
+    assert not asyncio.run(project.rate_limit.is_rate_limited(["user-1"]))
+
+
+def test_fixed_window_counts_until_limit_then_resets(fake_redis, monkeypatch):
+    _configure(fake_redis, "user-1", max_requests=2, duration=60)
+    now = [1_000_020.0]
+    monkeypatch.setattr(project.rate_limit.time, "time", lambda: now[0])
+
+    async def check():
+        return await project.rate_limit.is_rate_limited(["user-1"])
+
+    assert not asyncio.run(check())
+    assert not asyncio.run(check())
+    assert asyncio.run(check())
+
+    now[0] += 60
+    assert not asyncio.run(check())
+
+
+def test_window_counter_expires_with_duration(fake_redis, monkeypatch):
+    _configure(fake_redis, "example.com", max_requests=5, duration=30)
+    monkeypatch.setattr(project.rate_limit.time, "time", lambda: 90.0)
+    asyncio.run(project.rate_limit.is_rate_limited(["example.com"]))
+    ttl = asyncio.run(fake_redis.ttl("rl:example.com:3"))
+    assert 0 < ttl <= 30
+
+
+def test_middleware_returns_429_for_limited_domain(fake_redis):
+    _configure(fake_redis, "example.com", max_requests=1, duration=60)
+    client = TestClient(_app())
+
+    first = client.post("/content/retrieve", params={"url": "https://example.com/a"})
+    second = client.post("/content/retrieve", params={"url": "https://example.com/b"})
+    other = client.post("/content/retrieve", params={"url": "https://other.org/"})
+
+    assert first.status_code == 200
+    assert second.status_code == 429
+    assert second.json() == {"error": "Rate limit exceeded"}
+    assert other.status_code == 200
+
+
+def test_middleware_fails_open_when_redis_is_down(monkeypatch):
+    class DownRedis:
+        async def mget(self, keys):
+            raise redis.exceptions.ConnectionError("connection refused")
+
+    monkeypatch.setattr(project.redis_client, "_client", DownRedis())
+    client = TestClient(_app())
+
+    response = client.post("/content/retrieve", params={"url": "https://example.com/"})
+
+    assert response.status_code == 200